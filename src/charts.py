@@ -7,7 +7,7 @@ from pathlib import Path
 # -----------------------------
 # PATHS
 # -----------------------------
-INPUT_PATH = Path("data/processed/final_dataset.csv")
+INPUT_PATH = Path("data/processed/final_dataset.parquet")
 OUTPUT_DIR = Path("charts/outputs")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -21,22 +21,27 @@ sns.set_style("whitegrid")
 # -----------------------------
 # LOAD DATA
 # -----------------------------
-def load_data(path: Path) -> pd.DataFrame:
+def load_data(path: Path) -> tuple[pd.DataFrame, pd.Index]:
     if not path.exists():
         raise FileNotFoundError(f"Input dataset not found: {path}")
-    return pd.read_csv(path)
+
+    df = pd.read_parquet(path)
+
+    # Resolve the engineered category columns once so each plot that
+    # needs them does not rebuild the filter.
+    tag_cols = df.columns[
+        df.columns.str.startswith("tag_")
+        & ~df.columns.isin(["tags_list", "tags_string"])
+    ]
+
+    return df, tag_cols
 
 
 # -----------------------------
 # CHARTS
 # -----------------------------
-def plot_event_category_distribution(df: pd.DataFrame) -> None:
-    tag_cols = [
-        col for col in df.columns
-        if col.startswith("tag_") and col not in {"tags_list", "tags_string"}
-    ]
-
-    tag_counts = df[tag_cols].sum().sort_values(ascending=False)
+def plot_event_category_distribution(df: pd.DataFrame, tag_cols: pd.Index) -> None:
+    tag_counts = df[tag_cols].sum(axis=0).sort_values(ascending=False)
 
     plt.figure(figsize=(10, 6))
     sns.barplot(x=tag_counts.values, y=tag_counts.index)
@@ -139,10 +144,10 @@ def plot_top_venues(df: pd.DataFrame) -> None:
 # MAIN
 # -----------------------------
 def main() -> None:
-    df = load_data(INPUT_PATH)
+    df, tag_cols = load_data(INPUT_PATH)
     print("Dataset loaded:", df.shape)
 
-    plot_event_category_distribution(df)
+    plot_event_category_distribution(df, tag_cols)
     plot_price_by_weekday(df)
     plot_lead_time_free_vs_paid(df)
     plot_event_density_heatmap(df)
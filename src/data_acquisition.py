@@ -1,8 +1,12 @@
 import requests
-import json
+import orjson
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from requests.adapters import HTTPAdapter
+
 # -------------------------------
 # CONFIG IMPORT (LOCAL, NOT COMMITTED)
 # -------------------------------
@@ -26,6 +30,33 @@ except ImportError as e:
 OUTPUT_PATH = Path("data/raw/eventbrite_dublin_live.json")
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+MAX_WORKERS = 8
+
+
+# -------------------------------
+# RATE LIMITER
+# -------------------------------
+class RateLimiter:
+    """
+    Leaky-bucket limiter shared by the worker pool: at most one request
+    every `interval` seconds across all threads, so the polite delay
+    still holds when pages are fetched concurrently.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
 
 # -------------------------------
 # PAYLOAD BUILDER
@@ -56,7 +87,12 @@ def build_payload(page: int) -> dict:
 # -------------------------------
 # FETCH SINGLE PAGE
 # -------------------------------
-def fetch_page(session: requests.Session, page: int) -> dict | None:
+def fetch_page(
+    session: requests.Session, page: int, limiter: RateLimiter | None = None
+) -> dict | None:
+    if limiter is not None:
+        limiter.wait()
+
     url = f"{BASE_URL}?stable_id={STABLE_ID}"
     payload = build_payload(page)
 
@@ -78,6 +114,11 @@ def scrape_all(delay_s: float = 0.5) -> list[dict]:
         raise RuntimeError("STABLE_ID is not set. Live fetching is disabled.")
 
     session = requests.Session()
+    # One pooled adapter so the worker threads reuse TCP connections.
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2),
+    )
     session.headers.update(HEADERS)
     session.cookies.update(COOKIES)
 
@@ -90,11 +131,17 @@ def scrape_all(delay_s: float = 0.5) -> list[dict]:
 
     all_events = first["events"]["results"]
 
-    for page in range(2, total_pages + 1):
-        time.sleep(delay_s)
-        data = fetch_page(session, page)
-        if data:
-            all_events.extend(data["events"]["results"])
+    # Pages are independent, so fetch them concurrently; the shared
+    # limiter keeps the overall request rate at one per delay_s.
+    limiter = RateLimiter(delay_s)
+    pages = range(2, total_pages + 1)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for data in executor.map(
+            lambda page: fetch_page(session, page, limiter), pages
+        ):
+            if data:
+                all_events.extend(data["events"]["results"])
 
     print("Total events collected:", len(all_events))
     return all_events
@@ -106,8 +153,7 @@ def scrape_all(delay_s: float = 0.5) -> list[dict]:
 def main():
     events = scrape_all()
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
+    OUTPUT_PATH.write_bytes(orjson.dumps(events, option=orjson.OPT_INDENT_2))
 
     print(f"Live raw JSON saved to: {OUTPUT_PATH}")
 
@@ -1,9 +1,9 @@
-import json
 import ast
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import pandas as pd
 
 
@@ -11,39 +11,40 @@ import pandas as pd
 # PATHS
 # -----------------------------
 INPUT_PATH = Path("data/raw/eventbrite_dublin_live.json")
-OUTPUT_PATH = Path("data/processed/events_clean_base.csv")
+OUTPUT_PATH = Path("data/processed/events_clean_base.parquet")
 
 
 # -----------------------------
 # IO
 # -----------------------------
 def load_events_json(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(path.read_bytes())
 
 
 def normalize_events(events: List[Dict[str, Any]]) -> pd.DataFrame:
-    return pd.json_normalize(events)
+    # sep="_" produces the standardized names directly, so no rename
+    # pass over the columns is needed afterwards.
+    return pd.json_normalize(events, sep="_", max_level=3)
 
 
 # -----------------------------
 # HELPERS
 # -----------------------------
-def drop_fully_null_columns(df: pd.DataFrame) -> pd.DataFrame:
-    null_cols = df.columns[df.isna().sum() == len(df)]
-    return df.drop(columns=null_cols)
-
-
-def safe_drop(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
-    return df.drop(columns=[c for c in cols if c in df.columns])
-
-
-def extract_from_locations(row: Any, target_type: str) -> Optional[str]:
+def parse_list_string(x: Any) -> Any:
+    """
+    Parse one stringified list back into a Python object. orjson is the
+    fast path; ast.literal_eval covers Python-repr strings (single
+    quotes) that are not valid JSON.
+    """
+    if not isinstance(x, str):
+        return x
     try:
-        data = ast.literal_eval(row) if isinstance(row, str) else row
-    except Exception:
-        return None
+        return orjson.loads(x)
+    except orjson.JSONDecodeError:
+        return ast.literal_eval(x)
+
 
+def extract_from_locations(data: Any, target_type: str) -> Optional[str]:
     if not isinstance(data, list):
         return None
 
@@ -53,12 +54,7 @@ def extract_from_locations(row: Any, target_type: str) -> Optional[str]:
     return None
 
 
-def parse_address(row: Any) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    try:
-        data = ast.literal_eval(row) if isinstance(row, str) else row
-    except Exception:
-        return None, None, None
-
+def parse_address(data: Any) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     if not isinstance(data, list) or len(data) < 2:
         return None, None, None
 
@@ -71,12 +67,7 @@ def parse_address(row: Any) -> Tuple[Optional[str], Optional[str], Optional[str]
     return street, line2, city
 
 
-def extract_tags(row: Any) -> Tuple[List[str], str]:
-    try:
-        data = ast.literal_eval(row) if isinstance(row, str) else row
-    except Exception:
-        return [], ""
-
+def extract_tags(data: Any) -> Tuple[List[str], str]:
     if not isinstance(data, list):
         return [], ""
 
@@ -100,10 +91,9 @@ def to_utc_naive_datetime(series: pd.Series) -> pd.Series:
 
 
 def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Only the column Index is touched, so no frame copy is needed.
     df.columns = (
         df.columns.str.lower()
-        .str.replace(".", "_", regex=False)
         .str.replace(" ", "_", regex=False)
     )
     return df
@@ -113,61 +103,89 @@ def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
 # PIPELINE
 # -----------------------------
 def clean_events(df: pd.DataFrame) -> pd.DataFrame:
-    # 1) Drop fully-null columns
-    df = drop_fully_null_columns(df)
-
-    # 2) Drop noisy nested columns (if they exist)
-    df = safe_drop(df, [
-        "urgency_signals.messages",
-        "urgency_signals.categories",
-        "public_collections.creator_collections.collections",
+    # Column drops are collected here and applied in one pass at the
+    # end, so the frame is copied once instead of once per drop step.
+    cols_to_drop = set()
+
+    # 1) Fully-null columns
+    cols_to_drop.update(df.columns[df.isna().sum() == len(df)])
+
+    # 2) Noisy nested columns (if they exist)
+    cols_to_drop.update([
+        "urgency_signals_messages",
+        "urgency_signals_categories",
+        "public_collections_creator_collections_collections",
     ])
 
-    # 3) Extract city/neighbourhood from locations
+    # 3) The nested list columns come straight from json_normalize as
+    # real Python lists; they are only strings if the frame round-tripped
+    # through text. Detect that once per column and pre-parse in bulk,
+    # so the extraction helpers can assume list/None input.
+    list_cols = [
+        "locations",
+        "tags",
+        "primary_venue_address_localized_multi_line_address_display",
+    ]
+    for col in list_cols:
+        if col in df.columns:
+            sample = df[col].dropna()
+            if len(sample) and isinstance(sample.iloc[0], str):
+                df[col] = df[col].map(parse_list_string)
+
+    # 4) Extract city/neighbourhood from locations
     if "locations" in df.columns:
         df["city"] = df["locations"].apply(lambda x: extract_from_locations(x, "locality"))
         df["neighbourhood"] = df["locations"].apply(lambda x: extract_from_locations(x, "neighbourhood"))
 
-    # 4) Extract venue address parts
-    addr_col = "primary_venue.address.localized_multi_line_address_display"
+    # 5) Extract venue address parts; build the columns directly from
+    # the records instead of a zip(*...) tuple-unpacking pass
+    addr_col = "primary_venue_address_localized_multi_line_address_display"
     if addr_col in df.columns:
-        df["venue_street"], df["venue_line2"], df["venue_city"] = zip(
-            *df[addr_col].apply(parse_address)
-        )
+        df = df.join(pd.DataFrame(
+            df[addr_col].map(parse_address).tolist(),
+            columns=["venue_street", "venue_line2", "venue_city"],
+            index=df.index,
+        ))
 
-    # 5) Extract tags_list + tags_string
+    # 6) Extract tags_list + tags_string
     if "tags" in df.columns:
-        df["tags_list"], df["tags_string"] = zip(*df["tags"].apply(extract_tags))
-
-    # 6) Drop sales timezone columns (if present)
-    df = safe_drop(df, [
-        "event_sales_status.start_sales_date.timezone",
-        "event_sales_status.start_sales_date.local",
-        "event_sales_status.start_sales_date.utc",
-        "event_sales_status.end_sales_date.timezone",
-        "event_sales_status.end_sales_date.local",
-        "event_sales_status.end_sales_date.utc",
-        "open_discount.end_date",
+        df = df.join(pd.DataFrame(
+            df["tags"].map(extract_tags).tolist(),
+            columns=["tags_list", "tags_string"],
+            index=df.index,
+        ))
+
+    # 7) Sales timezone columns (if present)
+    cols_to_drop.update([
+        "event_sales_status_start_sales_date_timezone",
+        "event_sales_status_start_sales_date_local",
+        "event_sales_status_start_sales_date_utc",
+        "event_sales_status_end_sales_date_timezone",
+        "event_sales_status_end_sales_date_local",
+        "event_sales_status_end_sales_date_utc",
+        "open_discount_end_date",
     ])
 
-    # 7) Drop the raw nested fields after extraction
-    df = safe_drop(df, [
+    # 8) The raw nested fields after extraction
+    cols_to_drop.update([
         "locations",
         "tags",
-        "primary_venue.address.localized_multi_line_address_display",
+        "primary_venue_address_localized_multi_line_address_display",
     ])
 
-    # 8) Datetime normalization (only if columns exist)
+    df = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
+
+    # 9) Datetime normalization (only if columns exist)
     if "published" in df.columns:
         df["published"] = to_utc_naive_datetime(df["published"])
 
     # Note: start_datetime is NOT created in cleaning.
     # That is feature-engineering responsibility (date+time -> datetime).
 
-    # 9) Standardize column names
+    # 10) Standardize column names
     df = standardize_column_names(df)
 
-    # 10) Fill missing values (only where columns exist)
+    # 11) Fill missing values (only where columns exist)
     if "summary" in df.columns:
         df["summary"] = df["summary"].fillna("")
     if "venue_city" in df.columns:
@@ -177,6 +195,12 @@ def clean_events(df: pd.DataFrame) -> pd.DataFrame:
     if "neighbourhood" in df.columns:
         df["neighbourhood"] = df["neighbourhood"].fillna("unknown")
     
+    # 12) Discount amounts arrive as a mix of str and int from the API;
+    # coerce to numeric so the column has a single concrete type
+    for col in ["open_discount_percent_off", "open_discount_amount_off"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
     df = df.drop_duplicates(subset="id", keep="first")
 
     return df
@@ -193,8 +217,8 @@ def main() -> None:
     print("Shape AFTER cleaning:", df_clean.shape)
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.to_csv(OUTPUT_PATH, index=False)
-    
+    df_clean.to_parquet(OUTPUT_PATH, engine="pyarrow", compression="zstd", index=False)
+
     print(f"Cleaned data saved to {OUTPUT_PATH}")
 
 
@@ -1,22 +1,129 @@
 import ast
-import json
+import hashlib
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 import re
 
+import numba
+import numpy as np
+import orjson
 import pandas as pd
 
 
 # -----------------------------
 # PATHS
 # -----------------------------
-INPUT_PATH = Path("data/processed/events_clean_base.csv")
-OUTPUT_PATH = Path("data/processed/final_dataset.csv")
+INPUT_PATH = Path("data/processed/events_clean_base.parquet")
+OUTPUT_PATH = Path("data/processed/final_dataset.parquet")
+
+# Feature results are cached per input-content hash; bump CODE_VERSION
+# whenever the feature logic changes so stale entries are ignored.
+# Set FE_NOCACHE=1 to force recomputation.
+CACHE_DIR = Path("data/processed/.cache")
+CODE_VERSION = "1"
+
+# The cleaned data stores dates as "YYYY-MM-DD" and times as "HH:MM".
+# Passing the format explicitly skips pandas' per-value inference path.
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# Bin edges mirroring categorize_price: 0 -> free, <10 -> low,
+# <30 -> medium, rest -> high.
+PRICE_BINS = [-0.001, 0.001, 10, 30, np.inf]
+PRICE_LABELS = ["free", "low", "medium", "high"]
+
+# Weekday names indexed by pandas dayofweek (Monday=0).
+WEEKDAY_NAMES = [
+    "Monday", "Tuesday", "Wednesday", "Thursday",
+    "Friday", "Saturday", "Sunday",
+]
 
 
 # -----------------------------
 # HELPERS
 # -----------------------------
+TAG_AGGREGATION_MAP: Dict[str, List[str]] = {
+    "tag_music_event": [
+        "music", "concert or performance", "livemusic", "concert", "musical",
+        "edm / electronic", "techno", "rock", "pop", "indie", "folk", "classical",
+        "blues & jazz", "latin", "house", "alternative", "dj", "tribute",
+        "livemusicvenue", "liveevent", "choir", "irishmusic", "live"
+    ],
+    "tag_nightlife_social": [
+        "party or social gathering", "party", "nightlife", "nightclub",
+        "celebration", "fun", "dance", "dinner or gala", "social"
+    ],
+    "tag_dating_singles": [
+        "dating", "singles", "speeddating", "speed_dating", "matchmaking",
+        "matchmaker", "dublin_speed_dating", "speed_date"
+    ],
+    "tag_education_business": [
+        "class, training, or workshop", "workshop", "conference", "business & professional",
+        "seminar or talk", "networking", "meeting or networking event",
+        "startups & small business", "training", "education", "science & technology",
+        "tradeshow, consumer show, or expo"
+    ],
+    "tag_arts_culture": [
+        "performing & visual arts", "art", "painting", "theatre", "performance",
+        "film, media & entertainment", "creativity", "creative", "craft", "diy",
+        "community & culture", "community", "comedy", "standupcomedy",
+        "standup", "comedy_club"
+    ],
+    "tag_wellness_health": [
+        "health & wellness", "yoga", "meditation", "mindfulness", "relaxation",
+        "soundbath", "soundhealing", "personal health", "medicine", "wellness",
+        "cacao", "religion & spirituality", "women_empowerment"
+    ],
+    "tag_food_drink": [
+        "food & drink", "food", "wine", "cacao"
+    ],
+    "tag_holiday": [
+        "christmas", "seasonal & holiday", "festive", "holiday", "christmas_events",
+        "new years eve", "newyearseve", "countdown", "carols"
+    ],
+    "tag_hobbies_lifestyle": [
+        "hobbies & special interest", "home & lifestyle", "tour", "travel",
+        "travel & outdoor", "sports & fitness", "family & education",
+        "family_friendly", "game or competition", "nature"
+    ],
+}
+
+# Inverted lookup: tag -> categories it belongs to
+# (a tag like "cacao" can feed more than one category).
+TAG_TO_CATEGORIES: Dict[str, List[str]] = {}
+for _category, _tags in TAG_AGGREGATION_MAP.items():
+    for _tag in _tags:
+        TAG_TO_CATEGORIES.setdefault(_tag, []).append(_category)
+
+# Bitmask encoding of the vocabulary: each known tag gets one bit, so a
+# row's tag set and a category's tag set are each a couple of uint64
+# words and membership is a bitwise AND.
+TAG_VOCABULARY = sorted(TAG_TO_CATEGORIES)
+TAG_TO_INDEX = {tag: i for i, tag in enumerate(TAG_VOCABULARY)}
+MASK_WORDS = (len(TAG_VOCABULARY) + 63) // 64
+
+CATEGORY_MASKS = np.zeros((len(TAG_AGGREGATION_MAP), MASK_WORDS), dtype=np.uint64)
+for _j, _tags in enumerate(TAG_AGGREGATION_MAP.values()):
+    for _tag in _tags:
+        _i = TAG_TO_INDEX[_tag]
+        CATEGORY_MASKS[_j, _i // 64] |= np.uint64(1 << (_i % 64))
+
+
+@numba.njit(parallel=True, cache=True)
+def _tag_category_kernel(row_masks, cat_masks):
+    n, words = row_masks.shape
+    k = cat_masks.shape[0]
+    out = np.zeros((n, k), dtype=np.int8)
+    for i in numba.prange(n):
+        for j in range(k):
+            hit = np.uint64(0)
+            for w in range(words):
+                hit |= row_masks[i, w] & cat_masks[j, w]
+            out[i, j] = 1 if hit else 0
+    return out
+
+
 def categorize_price(x: float) -> str:
     if x == 0:
         return "free"
@@ -27,55 +134,28 @@ def categorize_price(x: float) -> str:
     else:
         return "high"
 
-def build_full_address(row):
-    parts = [
-        row.get("street"),
-        row.get("address_line2"),
-        row.get("city_resolved"),
-        row.get("eircode"),
-    ]
-
-    return ", ".join([p for p in parts if isinstance(p, str) and p.lower() != "unknown"])
-
-def resolve_city(row):
-    venue_city = row.get("venue_city")
-    location_city = row.get("location_city")
-
-    if isinstance(venue_city, str) and venue_city.lower() != "unknown":
-        return venue_city
-    return location_city
-
-def dublin_area_cluster(row):
-    district = row.get("dublin_postal_district")
-
-    if district is None:
-        return "unknown"
-    if district <= 2:
-        return "city_centre"
-    if district in [4, 6]:
-        return "south_inner"
-    if district >= 7:
-        return "outer_dublin"
-    return "other"
-
-
-
-def safe_json_parse_and_normalize(x) -> List[str]:
-    if isinstance(x, str):
+def safe_json_parse(x) -> List[Any]:
+    """
+    Parse one stringified tags_list entry; only hit when the input
+    frame has round-tripped through text.
+    """
+    if not isinstance(x, str):
+        # Parquet round-trips list columns as numpy arrays.
+        return list(x) if isinstance(x, (list, np.ndarray)) else []
+    try:
+        data = orjson.loads(x)
+    except orjson.JSONDecodeError:
         try:
-            data = json.loads(x)
+            data = ast.literal_eval(x)
         except Exception:
-            try:
-                data = ast.literal_eval(x)
-            except Exception:
-                data = []
-    else:
-        data = x if isinstance(x, list) else []
-
-    return [str(tag).lower().strip() for tag in data]
+            data = []
+    return data if isinstance(data, list) else []
 
-EIRCODE_PATTERN = re.compile(r"\b([A-Z]\d{2})\s?([A-Z0-9]{4})\b")
+EIRCODE_PATTERN = re.compile(
+    r"\b(?P<routing_key>[A-Z]\d{2})\s?(?P<unique_id>[A-Z0-9]{4})\b"
+)
 
+@lru_cache(maxsize=None)
 def extract_eircode(address: str):
     if not isinstance(address, str):
         return None, None, None
@@ -84,8 +164,8 @@ def extract_eircode(address: str):
     if not match:
         return None, None, None
 
-    routing_key = match.group(1)
-    unique_id = match.group(2)
+    routing_key = match.group("routing_key")
+    unique_id = match.group("unique_id")
     full_eircode = f"{routing_key} {unique_id}"
 
     return full_eircode, routing_key, unique_id
@@ -93,6 +173,7 @@ def extract_eircode(address: str):
 
 POSTAL_DISTRICT_PATTERN = re.compile(r"DUBLIN\s+(\d{1,2})", re.IGNORECASE)
 
+@lru_cache(maxsize=None)
 def extract_dublin_postal_district(address: str):
     if not isinstance(address, str):
         return None
@@ -110,17 +191,21 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     # Datetime composition
     # -------------------------
     df["start_datetime"] = pd.to_datetime(
-        df["start_date"] + " " + df["start_time"], errors="coerce"
+        df["start_date"] + " " + df["start_time"],
+        format=DATETIME_FORMAT, errors="coerce", cache=True,
     )
     df["end_datetime"] = pd.to_datetime(
-        df["end_date"] + " " + df["end_time"], errors="coerce"
+        df["end_date"] + " " + df["end_time"],
+        format=DATETIME_FORMAT, errors="coerce", cache=True,
     )
 
     df["duration_hours"] = (
         df["end_datetime"] - df["start_datetime"]
     ).dt.total_seconds() / 3600
 
-    df["published"] = pd.to_datetime(df["published"], errors="coerce")
+    df["published"] = pd.to_datetime(
+        df["published"], format="ISO8601", errors="coerce", cache=True
+    )
 
     # -------------------------
     # Price features
@@ -131,7 +216,12 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     df["is_free"] = df["price"] == 0
-    df["price_category"] = df["price"].apply(categorize_price)
+    # Vectorized binning; categorize_price stays as the scalar reference
+    # implementation (and for test.py) but is off the hot path.
+    df["price_category"] = pd.cut(
+        df["price"].fillna(0),
+        bins=PRICE_BINS, labels=PRICE_LABELS, right=False,
+    ).astype(object)
 
     # -------------------------
     # Column projection
@@ -151,79 +241,70 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     # -------------------------
     # Tag normalization
     # -------------------------
-    df["tags_list"] = df["tags_list"].apply(
-        safe_json_parse_and_normalize
+    # Explode once and lower/strip every tag through pandas' compiled
+    # string kernels instead of a Python loop per row; the exploded
+    # form is reused for the category bitmasks below. Stringified
+    # lists (text round-trips) are bulk-parsed up front.
+    tags = df["tags_list"]
+    sample = tags.dropna()
+    if len(sample) and isinstance(sample.iloc[0], str):
+        tags = tags.map(safe_json_parse)
+
+    exploded_tags = (
+        tags.explode().astype("string").str.lower().str.strip().dropna()
     )
 
-    
-    
-    aggregation_map = {
-    "tag_music_event": [
-        "music", "concert or performance", "livemusic", "concert", "musical",
-        "edm / electronic", "techno", "rock", "pop", "indie", "folk", "classical",
-        "blues & jazz", "latin", "house", "alternative", "dj", "tribute",
-        "livemusicvenue", "liveevent", "choir", "irishmusic", "live"
-    ],
-    "tag_nightlife_social": [
-        "party or social gathering", "party", "nightlife", "nightclub",
-        "celebration", "fun", "dance", "dinner or gala", "social"
-    ],
-    "tag_dating_singles": [
-        "dating", "singles", "speeddating", "speed_dating", "matchmaking",
-        "matchmaker", "dublin_speed_dating", "speed_date"
-    ],
-    "tag_education_business": [
-        "class, training, or workshop", "workshop", "conference", "business & professional",
-        "seminar or talk", "networking", "meeting or networking event",
-        "startups & small business", "training", "education", "science & technology",
-        "tradeshow, consumer show, or expo"
-    ],
-    "tag_arts_culture": [
-        "performing & visual arts", "art", "painting", "theatre", "performance",
-        "film, media & entertainment", "creativity", "creative", "craft", "diy",
-        "community & culture", "community", "comedy", "standupcomedy",
-        "standup", "comedy_club"
-    ],
-    "tag_wellness_health": [
-        "health & wellness", "yoga", "meditation", "mindfulness", "relaxation",
-        "soundbath", "soundhealing", "personal health", "medicine", "wellness",
-        "cacao", "religion & spirituality", "women_empowerment"
-    ],
-    "tag_food_drink": [
-        "food & drink", "food", "wine", "cacao"
-    ],
-    "tag_holiday": [
-        "christmas", "seasonal & holiday", "festive", "holiday", "christmas_events",
-        "new years eve", "newyearseve", "countdown", "carols"
-    ],
-    "tag_hobbies_lifestyle": [
-        "hobbies & special interest", "home & lifestyle", "tour", "travel",
-        "travel & outdoor", "sports & fitness", "family & education",
-        "family_friendly", "game or competition", "nature"
-    ]
-}
-
-    for new_col, tags in aggregation_map.items():
-        df[new_col] = df["tags_list"].apply(
-            lambda x: 1 if any(tag in x for tag in tags) else 0
+    # Regroup as object so the result holds plain Python lists; an
+    # Arrow-backed agg would hand back Arrow list values instead.
+    grouped = (
+        exploded_tags.astype(object).groupby(level=0).agg(list).reindex(df.index)
+    )
+    untagged = grouped.isna()
+    if untagged.any():
+        grouped.loc[untagged] = pd.Series(
+            [[] for _ in range(int(untagged.sum()))],
+            index=grouped.index[untagged],
         )
+    df["tags_list"] = grouped
+
+    # Encode each row's tags as a bitmask over the known vocabulary and
+    # let the JIT kernel AND them against the per-category masks - one
+    # branchless pass instead of per-row membership scans.
+    known = exploded_tags.map(TAG_TO_INDEX).dropna()
+    rows = df.index.get_indexer(known.index)
+    bits = known.to_numpy(dtype=np.int64)
+
+    row_masks = np.zeros((len(df), MASK_WORDS), dtype=np.uint64)
+    np.bitwise_or.at(
+        row_masks,
+        (rows, bits // 64),
+        np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)),
+    )
+
+    df[list(TAG_AGGREGATION_MAP)] = _tag_category_kernel(row_masks, CATEGORY_MASKS)
 
     # -------------------------
     # Temporal features
     # -------------------------
-    df["event_month"] = df["start_datetime"].dt.month
-    df["event_weekday"] = df["start_datetime"].dt.day_name()
-    df["event_hour"] = df["start_datetime"].dt.hour
-    df["event_minute"] = df["start_datetime"].dt.minute
-
-    df["is_weekend"] = df["event_weekday"].isin(
-        ["Saturday", "Sunday"]
+    # Bind the .dt accessor once and derive the weekday features from
+    # the integer dayofweek; the name column is a small categorical
+    # lookup instead of per-row Python strings from .day_name().
+    start_dt = df["start_datetime"].dt
+    dayofweek = start_dt.dayofweek.astype("int8")
+
+    df[["event_month", "event_hour", "event_minute"]] = np.stack(
+        [start_dt.month.values, start_dt.hour.values, start_dt.minute.values],
+        axis=1,
     )
+    df["event_weekday"] = pd.Categorical.from_codes(
+        dayofweek, categories=WEEKDAY_NAMES
+    )
+
+    df["is_weekend"] = dayofweek >= 5  # Saturday, Sunday
 
     df["is_weekend_night"] = (
-        ((df["event_weekday"] == "Friday") |
-         (df["event_weekday"] == "Saturday")) &
-        (df["event_hour"] >= 18)
+        dayofweek.isin([4, 5])  # Friday, Saturday
+        & (df["event_hour"] >= 18)
     )
 
     # -------------------------
@@ -254,30 +335,53 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
         .str.replace(" ", "_", regex=False)
     )
 
-    df["tags_list"] = df["tags_list"].apply(json.dumps)
-    df = df.drop_duplicates(subset="id", keep="first")
-
     for col in ["is_free", "is_weekend", "is_weekend_night"]:
         df[col] = df[col].astype(int)
 
-    
-    df[["eircode", "eircode_routing_key", "eircode_unique_id"]] = (
-    df["address_line2"]
-    .apply(lambda x: extract_eircode(x))
-    .apply(pd.Series)
-)
-    
-    df["dublin_postal_district"] = df["address_line2"].apply(
-    extract_dublin_postal_district
-)
 
-    df["full_address"] = df.apply(build_full_address, axis=1)
+    # Vectorized regex extraction (pandas' compiled str path) instead of
+    # calling the per-row helpers through .apply.
+    eircode_parts = df["address_line2"].str.upper().str.extract(EIRCODE_PATTERN)
+    df["eircode_routing_key"] = eircode_parts["routing_key"]
+    df["eircode_unique_id"] = eircode_parts["unique_id"]
+    df["eircode"] = eircode_parts["routing_key"] + " " + eircode_parts["unique_id"]
 
-    df["city"] = df.apply(resolve_city, axis=1)
+    df["dublin_postal_district"] = pd.to_numeric(
+        df["address_line2"].str.extract(POSTAL_DISTRICT_PATTERN, expand=False),
+        errors="coerce",
+    )
 
-    df["dublin_area_cluster"] = df.apply(
-    dublin_area_cluster, axis=1
-)
+    # Column-wise address/city/cluster features instead of row-wise
+    # df.apply(..., axis=1) passes.
+    address_parts = []
+    for col in ["street", "address_line2", "eircode"]:
+        part = df[col]
+        address_parts.append(
+            part.where(part.notna() & part.str.lower().ne("unknown"), "")
+        )
+    df["full_address"] = (
+        address_parts[0]
+        .str.cat(address_parts[1:], sep=", ")
+        .str.replace(r"(,\s*)+", ", ", regex=True)
+        .str.strip(", ")
+    )
+
+    df["city"] = df["venue_city"].where(
+        df["venue_city"].notna() & df["venue_city"].str.lower().ne("unknown"),
+        df["location_city"],
+    )
+
+    district = df["dublin_postal_district"]
+    df["dublin_area_cluster"] = np.select(
+        [
+            district.isna(),
+            district <= 2,
+            district.isin([4, 6]),
+            district >= 7,
+        ],
+        ["unknown", "city_centre", "south_inner", "outer_dublin"],
+        default="other",
+    )
     
     df["price_missing"] = df["price"].isna().astype(int)
     df["price"] = df["price"].fillna(0)
@@ -289,6 +393,34 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     df["dublin_postal_district"] = df["dublin_postal_district"].fillna(-1).astype(int)
     df["tags_string"] = df["tags_string"].fillna("")
 
+    df = downcast_dtypes(df)
+
+    return df
+
+
+def downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the frame before export: low-cardinality strings become
+    category, binary flags and small ints become int8. The CSV text
+    output is unchanged.
+    """
+    category_cols = [
+        "venue_city", "city", "location_city", "neighbourhood",
+        "price_category", "event_weekday", "dublin_area_cluster",
+    ]
+    for col in category_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    int8_cols = [
+        c for c in df.columns
+        if c.startswith(("tag_", "is_")) or c == "price_missing"
+    ]
+    int8_cols += ["event_month", "event_hour", "event_minute",
+                  "dublin_postal_district"]
+    for col in int8_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("int8")
 
     return df
 
@@ -373,19 +505,42 @@ def order_columns(df_features: pd.DataFrame) -> pd.DataFrame:
 # -----------------------------
 # MAIN
 # -----------------------------
+def compute_cache_key(path: Path) -> str:
+    """Hash the input file content (in chunks) plus the code version."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            hasher.update(chunk)
+    return f"{hasher.hexdigest()}_{CODE_VERSION}"
+
+
 def main() -> None:
-    df = pd.read_csv(INPUT_PATH)
-    print("Input shape:", df.shape)
+    use_cache = os.environ.get("FE_NOCACHE") != "1"
+    cache_path = CACHE_DIR / f"{compute_cache_key(INPUT_PATH)}.parquet"
+
+    if use_cache and cache_path.exists():
+        df_features = pd.read_parquet(cache_path)
+        print(f"Loaded cached features for unchanged input: {cache_path}")
+    else:
+        df = pd.read_parquet(INPUT_PATH)
+        print("Input shape:", df.shape)
 
-    df_features = engineer_features(df)
+        df_features = engineer_features(df)
+        df_features = order_columns(df_features)
+
+        if use_cache:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".parquet.tmp")
+            df_features.to_parquet(
+                tmp_path, engine="pyarrow", compression="zstd", index=False
+            )
+            os.replace(tmp_path, cache_path)
 
-    df_features = order_columns(df_features)
-    
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df_features.to_csv(OUTPUT_PATH, index=False)
+    df_features.to_parquet(OUTPUT_PATH, engine="pyarrow", compression="zstd", index=False)
 
     print("Output shape:", df_features.shape)
-  
+
     print(f"Feature dataset saved to: {OUTPUT_PATH}")
 
 
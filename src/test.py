@@ -5,7 +5,7 @@ import pandas as pd
 
 # Import functions to test
 from src.feature_engineering import categorize_price
-from src.data_cleaning import parse_address
+from src.data_cleaning import parse_address, parse_list_string
 
 
 # -----------------------------
@@ -40,14 +40,14 @@ def test_weekend_logic():
 
 def test_address_parser():
     # Perfect input
-    perfect_input = "['Grafton Street', 'Dublin 2']"
+    perfect_input = ["Grafton Street", "Dublin 2"]
     street, line2, city = parse_address(perfect_input)
 
     assert street == "Grafton Street"
     assert city == "Dublin"
 
     # Edge case
-    broken_input = "[]"
+    broken_input = []
     street, line2, city = parse_address(broken_input)
 
     assert street is None
@@ -56,6 +56,23 @@ def test_address_parser():
     print("✅ Address parsing tests passed.")
 
 
+def test_list_string_parser():
+    # JSON string (fast path)
+    assert parse_list_string('["Grafton Street", "Dublin 2"]') == [
+        "Grafton Street", "Dublin 2"
+    ]
+
+    # Python repr with single quotes (fallback path)
+    assert parse_list_string("['Grafton Street', 'Dublin 2']") == [
+        "Grafton Street", "Dublin 2"
+    ]
+
+    # Non-strings pass through untouched
+    assert parse_list_string(["already", "parsed"]) == ["already", "parsed"]
+
+    print("✅ List string parsing tests passed.")
+
+
 # -----------------------------
 # INTEGRATION TEST
 # -----------------------------
@@ -65,14 +82,11 @@ def test_database_integration():
 
     conn = sqlite3.connect(DB_PATH)
 
-    df_count = pd.read_sql(
-        "SELECT COUNT(*) AS cnt FROM events;",
-        conn,
-    )
+    # Single scalar: fetch it straight from the cursor instead of
+    # building a one-cell DataFrame.
+    count = conn.execute("SELECT COUNT(*) FROM events;").fetchone()[0]
 
     conn.close()
-
-    count = df_count["cnt"][0]
     assert count > 0, "❌ Integration test failed: database table is empty."
 
     print(f"✅ Integration test passed: {count} rows found in database.")
@@ -110,6 +124,7 @@ def main():
     test_price_categorization()
     test_weekend_logic()
     test_address_parser()
+    test_list_string_parser()
 
     print("\nRunning integration tests...")
     test_database_integration()